@@ -0,0 +1,69 @@
+"""Example code with common issues for the code review assistant to analyze."""
+
+from collections import Counter
+
+
+def find_duplicates(input_list):
+    """Find items that appear more than once in a list."""
+    counts = Counter(input_list)
+    return [item for item, count in counts.items() if count > 1]
+
+
+def process_data(data):
+    """Clean up a list of raw string values."""
+    return [
+        cleaned
+        for item in data
+        if item is not None and (cleaned := item.strip().lower())
+    ]
+
+
+def load_config(path):
+    """Load a configuration file."""
+    config_file = open(path)
+    data = config_file.read()
+    return data
+
+
+# def old_process_data(data):
+#     for item in data:
+#         print(item)
+
+
+password = "admin123"
+api_key = "sk-test-1234567890"
+
+
+class BaseHandler:
+    """Base class for request handlers."""
+
+    def handle(self, request):
+        try:
+            return self.process(request)
+        except:
+            return None
+
+    def process(self, request):
+        raise NotImplementedError
+
+
+class RequestHandler(BaseHandler):
+    """Handler that validates requests before processing."""
+
+    def process(self, request):
+        if request is None:
+            return None
+        if not isinstance(request, dict):
+            return None
+        return request
+
+
+class ApiHandler(RequestHandler):
+    """Handler for API requests."""
+
+    def process(self, request):
+        for key in request:
+            for other in request:
+                if key != other and request[key] == request[other]:
+                    return key
+        return None
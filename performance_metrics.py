@@ -0,0 +1,586 @@
+"""Performance metrics collection and analysis for code review."""
+
+import ast
+import functools
+import hashlib
+import io
+import logging
+import math
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# On-disk cache of per-file analysis results, keyed by path + mtime + size.
+# Bump the version whenever the shape of cached results changes.
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "code_review", "metrics")
+_CACHE_MAX_ENTRIES = 256
+_CACHE_VERSION = 5
+
+
+class Issue(NamedTuple):
+    """One complexity finding."""
+
+    kind: str
+    func: str
+    msg: str
+    severity: str
+
+
+class Hotspot(NamedTuple):
+    """A location likely to dominate runtime."""
+
+    location: str
+    reason: str
+    suggestion: str
+
+
+class Recommendation(NamedTuple):
+    """An algorithm-level improvement suggestion."""
+
+    target: str
+    recommendation: str
+
+
+@dataclass(slots=True)
+class FuncMetrics:
+    """Complexity metrics for a single function."""
+
+    cyc: int = 1
+    cog: int = 0
+    length: int = 0
+
+
+class ComplexityAnalyzer:
+    """Analyzes static complexity metrics of Python source code."""
+
+    # Exact-type dispatch codes for the metrics walker; node types not
+    # listed just forward their children.
+    _FUNC, _BRANCH, _BOOL, _COMP, _CLASS = range(5)
+    _DISPATCH = {
+        ast.FunctionDef: _FUNC,
+        ast.AsyncFunctionDef: _FUNC,
+        ast.If: _BRANCH,
+        ast.For: _BRANCH,
+        ast.While: _BRANCH,
+        ast.AsyncFor: _BRANCH,
+        ast.BoolOp: _BOOL,
+        ast.comprehension: _COMP,
+        ast.ClassDef: _CLASS,
+    }
+
+    def __init__(self):
+        self.funcs = {}
+        self.class_sizes = {}
+        self.inheritance_depth = {}
+
+    def analyze_file(self, file_path, use_cache=True):
+        """Analyze a Python file and return its complexity metrics.
+
+        Results are cached on disk keyed by path, mtime and size, so repeat
+        analyses of an unchanged file skip the read, parse and traversal.
+        """
+        cache_path = None
+        if use_cache:
+            try:
+                stat = os.stat(file_path)
+            except OSError as e:
+                logger.error(f"Could not read {file_path}: {e}")
+                return {"error": str(e)}
+            key = hashlib.blake2b(
+                f"{_CACHE_VERSION}|{file_path}|{stat.st_mtime_ns}|{stat.st_size}".encode()
+            ).hexdigest()
+            cache_path = os.path.join(_CACHE_DIR, f"{key}.pkl")
+            try:
+                with open(cache_path, 'rb') as cached:
+                    return pickle.load(cached)
+            except (OSError, pickle.PickleError, EOFError):
+                pass
+        try:
+            with open(file_path, 'r') as file:
+                code = file.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"Could not read {file_path}: {e}")
+            return {"error": str(e)}
+        results = self.analyze_code(code, file_name=file_path)
+        if cache_path is not None and "error" not in results:
+            self._store_cached(cache_path, results)
+        return results
+
+    @staticmethod
+    def _store_cached(cache_path, results):
+        """Atomically write results to the cache, evicting oldest entries."""
+        try:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, 'wb') as tmp:
+                pickle.dump(results, tmp)
+            os.replace(tmp_path, cache_path)
+            entries = [
+                os.path.join(_CACHE_DIR, name)
+                for name in os.listdir(_CACHE_DIR)
+                if name.endswith(".pkl")
+            ]
+            if len(entries) > _CACHE_MAX_ENTRIES:
+                entries.sort(key=os.path.getmtime)
+                for stale in entries[:len(entries) - _CACHE_MAX_ENTRIES]:
+                    os.remove(stale)
+        except OSError as e:
+            logger.warning(f"Could not write metrics cache: {e}")
+
+    def analyze_code(self, code, file_name="<unknown>"):
+        """Analyze a code string and return summary metrics and issues."""
+        try:
+            # PyCF_ONLY_AST with dont_inherit skips type-comment parsing
+            # and the caller's __future__ flag inheritance; we only need
+            # node types, names and line ranges.
+            tree = compile(code, file_name, "exec", ast.PyCF_ONLY_AST,
+                           dont_inherit=True)
+        except SyntaxError as e:
+            logger.error(f"Syntax error in {file_name}: {e}")
+            return {"error": f"Syntax error: {e}"}
+
+        # Start from a clean slate: the analyzer is reused across files
+        # and must not carry one file's functions into the next result.
+        self.funcs = {}
+        self.class_sizes = {}
+        self.inheritance_depth = {}
+        self._collect_metrics(tree, file_name)
+
+        funcs = self.funcs
+        return {
+            "summary": self._summarize(),
+            "issues": self._identify_complexity_issues(),
+            # The result dict keeps the original per-metric mapping shape
+            # so report generation and visualization stay unchanged.
+            "metrics": {
+                "cyclomatic_complexity": {name: f.cyc for name, f in funcs.items()},
+                "cognitive_complexity": {name: f.cog for name, f in funcs.items()},
+                "method_lengths": {
+                    name.rpartition("::")[2]: f.length for name, f in funcs.items()
+                },
+                "class_sizes": dict(self.class_sizes),
+                "inheritance_depth": dict(self.inheritance_depth),
+            },
+        }
+
+    def _collect_metrics(self, tree, file_name):
+        """Collect complexity and inheritance data in a single AST pass.
+
+        The walk carries (node, enclosing function, nesting level, scope
+        prefix) on an explicit stack so every node is visited exactly
+        once and each metric is attributed to its innermost enclosing
+        function. The prefix grows at each class and function so methods
+        are keyed file::Class.method and same-named methods in different
+        classes cannot shadow each other.
+        """
+        class_bases = {}
+        dispatch = self._DISPATCH
+        func_kind, branch_kind = self._FUNC, self._BRANCH
+        bool_kind, comp_kind, class_kind = self._BOOL, self._COMP, self._CLASS
+        iter_child_nodes = ast.iter_child_nodes
+        stack = [(child, None, 0, "") for child in iter_child_nodes(tree)]
+        append = stack.append
+        while stack:
+            node, func, nesting, prefix = stack.pop()
+            kind = dispatch.get(type(node))
+            if kind is not None:
+                if kind == branch_kind:
+                    if func is not None:
+                        func.cyc += 1
+                        func.cog += 1 + nesting
+                    nesting += 1
+                elif kind == func_kind:
+                    func = FuncMetrics(length=node.end_lineno - node.lineno + 1)
+                    self.funcs[f"{file_name}::{prefix}{node.name}"] = func
+                    nesting = 0
+                    prefix = f"{prefix}{node.name}."
+                elif kind == bool_kind:
+                    if func is not None:
+                        func.cyc += len(node.values) - 1
+                        func.cog += 1
+                elif kind == comp_kind:
+                    if func is not None:
+                        func.cyc += len(node.ifs)
+                else:  # class_kind
+                    self.class_sizes[node.name] = node.end_lineno - node.lineno + 1
+                    bases = []
+                    for base in node.bases:
+                        base_type = type(base)
+                        if base_type is ast.Name:
+                            bases.append(base.id)
+                        elif base_type is ast.Attribute:
+                            bases.append(base.attr)
+                    class_bases[node.name] = bases
+                    prefix = f"{prefix}{node.name}."
+            for child in iter_child_nodes(node):
+                append((child, func, nesting, prefix))
+
+        depths = {}
+        for class_name in class_bases:
+            self.inheritance_depth[class_name] = self._calculate_inheritance_depth(
+                class_name, class_bases, depths
+            )
+
+    def _calculate_inheritance_depth(self, class_name, class_bases, depths):
+        """Compute hierarchy depth with a memoized iterative DFS.
+
+        Finished classes are cached in `depths`; classes still being
+        resolved are marked with None, so a cycle contributes 0 just as
+        it did with the recursive version.
+        """
+        stack = [class_name]
+        while stack:
+            name = stack[-1]
+            if depths.get(name) is not None:
+                stack.pop()
+                continue
+            bases = class_bases.get(name)
+            if not bases:
+                depths[name] = 1
+                stack.pop()
+            elif name in depths:
+                # Second visit: every base has been resolved (or is part
+                # of a cycle), so the depth can be finalized.
+                depths[name] = 1 + max(depths.get(base) or 0 for base in bases)
+                stack.pop()
+            else:
+                depths[name] = None
+                for base in bases:
+                    if base not in depths:
+                        stack.append(base)
+        return depths[class_name]
+
+    def _identify_complexity_issues(self):
+        """Flag metrics that exceed the configured thresholds."""
+        issues = []
+        for name, func in self.funcs.items():
+            if func.cyc > 10:
+                issues.append(Issue(
+                    "complexity", name,
+                    f"Function {name} has high cyclomatic complexity ({func.cyc})",
+                    "high" if func.cyc > 15 else "medium",
+                ))
+            if func.cog > 15:
+                issues.append(Issue(
+                    "cognitive", name,
+                    f"Function {name} has high cognitive complexity ({func.cog})",
+                    "high" if func.cog > 25 else "medium",
+                ))
+            if func.length > 50:
+                short_name = name.rpartition('::')[2]
+                issues.append(Issue(
+                    "method_length", short_name,
+                    f"Method {short_name} is too long ({func.length} lines)",
+                    "high" if func.length > 100 else "medium",
+                ))
+        for name, size in self.class_sizes.items():
+            if size > 200:
+                issues.append(Issue(
+                    "class_size", name,
+                    f"Class {name} is too large ({size} lines)",
+                    "high" if size > 400 else "medium",
+                ))
+        for name, depth in self.inheritance_depth.items():
+            if depth > 3:
+                issues.append(Issue(
+                    "inheritance", name,
+                    f"Class {name} has deep inheritance ({depth} levels)",
+                    "medium",
+                ))
+        return issues
+
+    def _summarize(self):
+        """Compute all summary statistics in one pass over the metrics.
+
+        Running sums and maxima replace the per-metric statistics calls,
+        so the function table is read once however many summary fields
+        are reported.
+        """
+        cyc_sum = cog_sum = length_sum = 0
+        cyc_max = cog_max = length_max = 0
+        for func in self.funcs.values():
+            cyc_sum += func.cyc
+            cog_sum += func.cog
+            length_sum += func.length
+            if func.cyc > cyc_max:
+                cyc_max = func.cyc
+            if func.cog > cog_max:
+                cog_max = func.cog
+            if func.length > length_max:
+                length_max = func.length
+        func_count = len(self.funcs) or 1
+        size_sum = size_max = 0
+        for size in self.class_sizes.values():
+            size_sum += size
+            if size > size_max:
+                size_max = size
+        class_count = len(self.class_sizes) or 1
+        depth_max = 0
+        for depth in self.inheritance_depth.values():
+            if depth > depth_max:
+                depth_max = depth
+        return {
+            "avg_cyclomatic_complexity": cyc_sum / func_count,
+            "max_cyclomatic_complexity": cyc_max,
+            "avg_cognitive_complexity": cog_sum / func_count,
+            "max_cognitive_complexity": cog_max,
+            "avg_method_length": length_sum / func_count,
+            "max_method_length": length_max,
+            "avg_class_size": size_sum / class_count,
+            "max_class_size": size_max,
+            "max_inheritance_depth": depth_max,
+        }
+
+
+@dataclass(slots=True)
+class _Accum:
+    """Welford online accumulator for execution-time statistics."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    total: float = 0.0
+
+    def update(self, value):
+        """Fold one sample into the running statistics."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total += value
+
+
+class PerformanceProfiler:
+    """Collects runtime execution statistics for profiled functions."""
+
+    def __init__(self):
+        self.execution_times = {}
+
+    def profile_function(self, func):
+        """Wrap a function so each call records its execution time.
+
+        Samples are integer nanoseconds from the monotonic perf counter;
+        wall-clock time.time() loses sub-microsecond timings to float
+        resolution and can jump backwards.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                acc = self.execution_times.get(func.__name__)
+                if acc is None:
+                    acc = self.execution_times[func.__name__] = _Accum()
+                acc.update(elapsed)
+        return wrapper
+
+    @staticmethod
+    def _stats_from_accum(acc):
+        """Build the stats dict for one accumulator, in seconds."""
+        return {
+            "call_count": acc.count,
+            "average_time": acc.mean / 1e9,
+            "min_time": acc.min / 1e9,
+            "max_time": acc.max / 1e9,
+            "total_time": acc.total / 1e9,
+            "std_dev": (
+                math.sqrt(acc.m2 / (acc.count - 1)) / 1e9 if acc.count > 1 else 0
+            ),
+        }
+
+    def get_function_stats(self, name):
+        """Return timing statistics for a profiled function."""
+        acc = self.execution_times.get(name)
+        if acc is None or acc.count == 0:
+            return {"error": f"No profiling data for {name}"}
+        return self._stats_from_accum(acc)
+
+    def get_all_stats(self):
+        """Return timing statistics for every profiled function."""
+        return {
+            name: self._stats_from_accum(acc)
+            for name, acc in self.execution_times.items()
+            if acc.count
+        }
+
+
+class RuntimePerformanceAnalyzer:
+    """Combines static complexity analysis with runtime profiling data."""
+
+    # Entries kept in the in-memory results cache (FIFO eviction).
+    _RESULTS_CACHE_MAX = 64
+
+    def __init__(self):
+        self.complexity_analyzer = ComplexityAnalyzer()
+        self.profiler = PerformanceProfiler()
+        self._results_cache = {}
+
+    def analyze_code_file(self, file_path):
+        """Run the full performance analysis for a single file.
+
+        Results are cached in memory keyed by (path, mtime, size), so
+        re-analyzing an unchanged file returns immediately.
+        """
+        try:
+            stat = os.stat(file_path)
+            key = (file_path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        if key is not None:
+            cached = self._results_cache.get(key)
+            if cached is not None:
+                return cached
+        complexity_results = self.complexity_analyzer.analyze_file(file_path)
+        results = {
+            "file": file_path,
+            "complexity": complexity_results,
+            "hotspots": self._identify_hotspots(complexity_results),
+            "recommendations": self._generate_algorithm_recommendations(complexity_results),
+        }
+        if key is not None and "error" not in complexity_results:
+            if len(self._results_cache) >= self._RESULTS_CACHE_MAX:
+                self._results_cache.pop(next(iter(self._results_cache)))
+            self._results_cache[key] = results
+        return results
+
+    def analyze_code_files(self, file_paths):
+        """Analyze many files, fanning out across CPU cores when worthwhile.
+
+        Per-file analyses are independent and CPU-bound, so large batches
+        are distributed to a process pool. Small batches stay serial since
+        worker startup and result pickling would dominate.
+        """
+        file_paths = list(file_paths)
+        if len(file_paths) < _PARALLEL_MIN_FILES:
+            return {path: self.analyze_code_file(path) for path in file_paths}
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return dict(zip(
+                file_paths,
+                executor.map(_analyze_one, file_paths, chunksize=8),
+            ))
+
+    # Issue kinds that qualify as hotspots, with their suggestions.
+    _HOTSPOT_SUGGESTIONS = {
+        "complexity": "Break this function into smaller pieces",
+        "method_length": "Extract helper functions",
+    }
+
+    def _identify_hotspots(self, complexity_results):
+        """Pick out the locations most likely to dominate runtime.
+
+        The analyzer already flagged everything over threshold while
+        building its issue list, so this reads that list instead of
+        re-scanning the metric tables.
+        """
+        if "error" in complexity_results:
+            return []
+        suggestions = self._HOTSPOT_SUGGESTIONS
+        hotspots = []
+        for issue in complexity_results["issues"]:
+            suggestion = suggestions.get(issue.kind)
+            if suggestion is not None:
+                hotspots.append(Hotspot(issue.func, issue.msg, suggestion))
+        return hotspots
+
+    def _generate_algorithm_recommendations(self, complexity_results):
+        """Suggest algorithm-level improvements for flagged functions."""
+        recommendations = []
+        if "error" in complexity_results:
+            return recommendations
+        high_complexity = set()
+        long_methods = set()
+        for issue in complexity_results["issues"]:
+            if issue.kind == "complexity":
+                high_complexity.add(issue.func)
+            elif issue.kind == "method_length":
+                long_methods.add(issue.func)
+        both = {func for func in high_complexity if func.split("::")[-1] in long_methods}
+        for func in both:
+            recommendations.append(Recommendation(
+                func,
+                "Function is both long and branch-heavy; "
+                "consider redesigning the algorithm",
+            ))
+        for func in high_complexity - both:
+            recommendations.append(Recommendation(
+                func,
+                "Consider simplifying the control flow or using a dispatch table",
+            ))
+        return recommendations
+
+    def generate_performance_report(self, results, output_format="markdown"):
+        """Format analysis results as a markdown or plain-text report."""
+        summary = results["complexity"].get("summary", {})
+        issues = results["complexity"].get("issues", [])
+        buf = io.StringIO()
+        write = buf.write
+        if output_format == "markdown":
+            write("# Performance Analysis Report\n\n")
+            write(f"## File: {results['file']}\n\n")
+            write("## Summary\n\n")
+            write(f"- Average Cyclomatic Complexity: {summary.get('avg_cyclomatic_complexity', 0):.2f}\n")
+            write(f"- Maximum Cyclomatic Complexity: {summary.get('max_cyclomatic_complexity', 0)}\n")
+            write(f"- Average Cognitive Complexity: {summary.get('avg_cognitive_complexity', 0):.2f}\n")
+            write(f"- Maximum Cognitive Complexity: {summary.get('max_cognitive_complexity', 0)}\n")
+            write(f"- Average Method Length: {summary.get('avg_method_length', 0):.2f}\n")
+            write(f"- Maximum Method Length: {summary.get('max_method_length', 0)}\n")
+            write(f"- Maximum Inheritance Depth: {summary.get('max_inheritance_depth', 0)}\n")
+            write("\n## Issues\n\n")
+            for issue in issues:
+                write(f"- [{issue.severity}] {issue.msg}\n")
+            write("\n## Hotspots\n\n")
+            for hotspot in results["hotspots"]:
+                write(f"- **{hotspot.location}**: {hotspot.reason}\n")
+                write(f"  - Suggestion: {hotspot.suggestion}\n")
+            write("\n## Recommendations\n\n")
+            for rec in results["recommendations"]:
+                write(f"- **{rec.target}**: {rec.recommendation}\n")
+        else:
+            write(f"Performance Analysis Report\nFile: {results['file']}\n\n")
+            for key, value in summary.items():
+                write(f"{key}: {value}\n")
+            write("\n")
+            for issue in issues:
+                write(f"[{issue.severity}] {issue.msg}\n")
+            for hotspot in results["hotspots"]:
+                write(f"{hotspot.location}: {hotspot.reason}\n")
+            for rec in results["recommendations"]:
+                write(f"{rec.target}: {rec.recommendation}\n")
+        return buf.getvalue()
+
+
+# Minimum batch size before a process pool pays for its fork/pickle
+# overhead; smaller batches are analyzed serially.
+_PARALLEL_MIN_FILES = 4
+
+
+def _analyze_one(file_path):
+    """Analyze one file with a fresh analyzer (runs in worker processes)."""
+    return RuntimePerformanceAnalyzer().analyze_code_file(file_path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    analyzer = RuntimePerformanceAnalyzer()
+    results = analyzer.analyze_code_file("example_code.py")
+    print(analyzer.generate_performance_report(results))
+
+    from example_code import find_duplicates
+
+    profiled = analyzer.profiler.profile_function(find_duplicates)
+    for _ in range(100):
+        profiled([1, 2, 3, 2, 1, 3])
+    print(analyzer.profiler.get_function_stats("find_duplicates"))
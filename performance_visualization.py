@@ -0,0 +1,459 @@
+"""Visualization and HTML reporting for performance analysis results."""
+
+import hashlib
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Matches the parenthesised complexity value in a hotspot reason,
+# e.g. "High cyclomatic complexity (12)".
+_COMPLEXITY_RE = re.compile(r"\((\d+)\)")
+
+# Markdown-to-HTML substitutions for the embedded review template.
+# Longer keys must precede their prefixes ("### " before "## ", "\n\n"
+# before "\n") because alternation matches left to right.
+_MD_REPLACEMENTS = {
+    "- [ ] ": "&#9744; ",
+    "- [x] ": "&#9745; ",
+    "### ": "<h4>",
+    "## ": "<h3>",
+    "# ": "<h2>",
+    "\n\n": "<br><br>",
+    "\n": "<br>",
+}
+_MD_RE = re.compile("|".join(re.escape(key) for key in _MD_REPLACEMENTS))
+
+@lru_cache(maxsize=1)
+def has_visualization():
+    """Import matplotlib and numpy on first use; False when unavailable.
+
+    Importing this module stays cheap for callers that only want the
+    HTML report; the plotting stack is pulled in the first time a chart
+    is actually rendered.
+    """
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot
+        import numpy
+    except ImportError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=1)
+def _ylorrd():
+    """Severity colormap, resolved once on the first chart render."""
+    import matplotlib.pyplot as plt
+    return plt.get_cmap("YlOrRd")
+
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _jsonable(obj):
+    """Copy a metrics structure into plain JSON types.
+
+    The finding NamedTuples serialize as arrays under the stdlib encoder
+    but are tuple subclasses, which orjson hands to default=str as repr
+    strings; flattening them to dicts up front gives both engines the
+    same structured sidecar.
+    """
+    if isinstance(obj, dict):
+        return {key: _jsonable(value) for key, value in obj.items()}
+    if isinstance(obj, tuple) and hasattr(obj, "_asdict"):
+        return {key: _jsonable(value)
+                for key, value in obj._asdict().items()}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(item) for item in obj]
+    return obj
+
+
+def _dumps(obj):
+    """Serialize to canonical JSON bytes, via orjson when it is installed."""
+    obj = _jsonable(obj)
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=str)
+    return json.dumps(obj, sort_keys=True, default=str).encode()
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _score_hotspots(base_scores, has_high, has_long):
+        """Combine per-hotspot score components, clamped to the 0-10 scale."""
+        scores = base_scores + 2.0 * has_high + 1.0 * has_long
+        for i in range(scores.shape[0]):
+            if scores[i] > 10.0:
+                scores[i] = 10.0
+        return scores
+else:
+    def _score_hotspots(base_scores, has_high, has_long):
+        """Combine per-hotspot score components, clamped to the 0-10 scale."""
+        import numpy as np
+
+        scores = base_scores + 2.0 * has_high + 1.0 * has_long
+        np.minimum(scores, 10.0, out=scores)
+        return scores
+
+
+class PerformanceVisualizer:
+    """Renders charts and HTML reports for performance analysis results."""
+
+    def __init__(self, output_dir="performance_reports"):
+        self.output_dir = output_dir
+        # Maps a metrics content hash to the chart files rendered for it,
+        # so repeated reports over unchanged metrics skip rendering.
+        self._viz_cache = {}
+        os.makedirs(output_dir, exist_ok=True)
+        # One reusable Agg figure per thread; pyplot's global state
+        # machine is never touched. A Figure is not thread-safe, but
+        # separate figures can render concurrently, so each chart worker
+        # gets its own lazily created figure via _get_figure.
+        self._thread_state = threading.local()
+
+    def _get_figure(self):
+        """Return this thread's reusable figure, creating it on first use."""
+        state = self._thread_state
+        fig = getattr(state, "fig", None)
+        if fig is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=(16, 12))
+            state.canvas = FigureCanvasAgg(fig)
+            state.fig = fig
+        return fig
+
+    def create_complexity_chart(self, metrics, filename="complexity_chart.png"):
+        """Render a bar chart of the most complex functions."""
+        if not has_visualization():
+            logger.error("matplotlib is not available; skipping complexity chart")
+            return None
+        cyclomatic = (
+            metrics.get("complexity", {}).get("metrics", {})
+            .get("cyclomatic_complexity", {})
+        )
+        if not cyclomatic:
+            return None
+        import numpy as np
+
+        functions = heapq.nlargest(15, cyclomatic, key=cyclomatic.__getitem__)
+        complexity_values = [cyclomatic[f] for f in functions]
+        labels = [f.rpartition("::")[2] for f in functions]
+
+        fig = self._get_figure()
+        fig.clear()
+        ax = fig.add_subplot(111)
+        y_pos = list(range(len(functions)))
+        values = np.asarray(complexity_values)
+        colors = np.where(values <= 5, "green",
+                          np.where(values <= 10, "orange", "red"))
+        ax.barh(y_pos, complexity_values, align="center", color=colors)
+        text = ax.text
+        for i, value in enumerate(complexity_values):
+            text(value + 0.1, i, str(value), va="center")
+        axvline = ax.axvline
+        axvline(x=5, color="green", linestyle="--", alpha=0.5)
+        axvline(x=10, color="orange", linestyle="--", alpha=0.5)
+        axvline(x=15, color="red", linestyle="--", alpha=0.5)
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(labels)
+        ax.invert_yaxis()
+        ax.set_xlabel("Cyclomatic Complexity")
+        ax.set_title("Most Complex Functions")
+        output_file = os.path.join(self.output_dir, filename)
+        fig.savefig(output_file, dpi=90,
+                    pil_kwargs={"compress_level": 1})
+        return output_file
+
+    def create_hotspot_map(self, metrics, filename="hotspot_map.png"):
+        """Render a severity-colored bar chart of performance hotspots."""
+        if not has_visualization():
+            logger.error("matplotlib is not available; skipping hotspot map")
+            return None
+        hotspots = metrics.get("hotspots", [])[:15]
+        if not hotspots:
+            return None
+        import numpy as np
+
+        locations = [h.location.rpartition("::")[2] for h in hotspots]
+        # The string inspection stays in Python; the arithmetic runs in a
+        # kernel that numba can compile when it is installed.
+        count = len(hotspots)
+        base_scores = np.empty(count, dtype=np.float64)
+        has_high = np.empty(count, dtype=np.float64)
+        has_long = np.empty(count, dtype=np.float64)
+        for i, hotspot in enumerate(hotspots):
+            reason = hotspot.reason
+            score = 5.0
+            if "complexity" in reason:
+                match = _COMPLEXITY_RE.search(reason)
+                if match:
+                    score = min(10.0, int(match.group(1)) / 2.0)
+            base_scores[i] = score
+            has_high[i] = "high" in reason
+            has_long[i] = "long" in reason
+        severity_scores = _score_hotspots(base_scores, has_high, has_long)
+
+        fig = self._get_figure()
+        fig.clear()
+        ax = fig.add_subplot(111)
+        y_pos = list(range(len(hotspots)))
+        scores = np.asarray(severity_scores, dtype=np.float32)
+        ax.barh(y_pos, severity_scores, align="center",
+                color=_ylorrd()(scores / 10.0))
+        text = ax.text
+        for i, hotspot in enumerate(hotspots):
+            text(severity_scores[i] + 0.1, i, hotspot.reason,
+                 va="center", fontsize=8)
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(locations)
+        ax.invert_yaxis()
+        ax.set_xlabel("Severity")
+        ax.set_xlim(0, 12)
+        ax.set_title("Performance Hotspots")
+        output_file = os.path.join(self.output_dir, filename)
+        fig.savefig(output_file, dpi=90,
+                    pil_kwargs={"compress_level": 1})
+        return output_file
+
+    def create_performance_dashboard(self, metrics, filename="performance_dashboard.png"):
+        """Render the 2x2 dashboard of distribution, issues, risk and length."""
+        if not has_visualization():
+            logger.error("matplotlib is not available; skipping dashboard")
+            return None
+        import numpy as np
+
+        complexity = metrics.get("complexity", {})
+        summary = complexity.get("summary", {})
+        metric_tables = complexity.get("metrics", {})
+        cyclomatic = metric_tables.get("cyclomatic_complexity", {})
+        issues = complexity.get("issues", [])
+
+        fig = self._get_figure()
+        fig.clear()
+        axes = fig.subplots(2, 2)
+        fig.suptitle("Performance Analysis Dashboard", fontsize=16)
+
+        if cyclomatic:
+            values = np.fromiter(cyclomatic.values(), dtype=np.int32,
+                                 count=len(cyclomatic))
+            # Clamp the overflow edge so the bins stay monotonic when
+            # every function sits below 30; histogram rejects otherwise.
+            bins = np.array([0, 5, 10, 15, 20, 25, 30,
+                             max(31, int(values.max()) + 1)])
+            axes[0, 0].hist(values, bins=bins, color="steelblue",
+                            edgecolor="black")
+            axes[0, 0].set_title("Cyclomatic Complexity Distribution")
+            axes[0, 0].set_xlabel("Complexity")
+            axes[0, 0].set_ylabel("Functions")
+
+        if issues:
+            issue_types = Counter(issue.kind for issue in issues)
+            axes[0, 1].pie(issue_types.values(), labels=issue_types.keys(),
+                           autopct="%1.0f%%")
+            axes[0, 1].set_title("Issue Types")
+
+        metrics_names = ["Complexity", "Method Length", "Class Size", "Inheritance"]
+        raw = np.array([summary.get("max_cyclomatic_complexity", 0),
+                        summary.get("max_method_length", 0),
+                        summary.get("max_class_size", 0),
+                        summary.get("max_inheritance_depth", 0)],
+                       dtype=np.float64)
+        divisors = np.array([3.0, 20.0, 100.0, 1.5])
+        values = np.minimum(10.0, raw / divisors)
+        angles = np.linspace(0, 2 * np.pi, len(metrics_names),
+                             endpoint=False)
+        # Close the polygon by appending the first point; the label list
+        # is left untouched.
+        closed_values = np.concatenate([values, values[:1]])
+        closed_angles = np.concatenate([angles, angles[:1]])
+        axes[1, 0].remove()
+        radar = fig.add_subplot(2, 2, 3, polar=True)
+        radar.plot(closed_angles, closed_values, "o-", linewidth=2)
+        radar.fill(closed_angles, closed_values, alpha=0.25)
+        radar.set_thetagrids(np.degrees(angles), metrics_names)
+        radar.set_ylim(0, 10)
+        radar.set_title("Risk Profile")
+
+        method_lengths = metric_tables.get("method_lengths", {})
+        if method_lengths:
+            names = heapq.nlargest(10, method_lengths,
+                                   key=method_lengths.__getitem__)
+            lengths = [method_lengths[n] for n in names]
+            axes[1, 1].bar(range(len(names)), lengths, color="salmon")
+            axes[1, 1].set_xticks(range(len(names)))
+            axes[1, 1].set_xticklabels(names, rotation=45, ha="right")
+            axes[1, 1].set_title("Longest Methods")
+            axes[1, 1].set_ylabel("Lines")
+
+        fig.tight_layout()
+        output_file = os.path.join(self.output_dir, filename)
+        fig.savefig(output_file, dpi=90,
+                    pil_kwargs={"compress_level": 1})
+        return output_file
+
+    def create_html_report(self, metrics, filename="performance_report.html"):
+        """Generate the full HTML report with embedded charts."""
+        # Serialize once: the bytes feed both the cache key and the
+        # machine-readable sidecar written next to the HTML.
+        payload = _dumps(metrics)
+        key = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        visualizations = self._viz_cache.get(key)
+        if visualizations is None or not all(
+            os.path.exists(os.path.join(self.output_dir, name))
+            for name in visualizations.values()
+        ):
+            visualizations = {}
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                chart_future = pool.submit(self.create_complexity_chart,
+                                           metrics)
+                hotspot_future = pool.submit(self.create_hotspot_map, metrics)
+                dashboard_future = pool.submit(
+                    self.create_performance_dashboard, metrics)
+                chart = chart_future.result()
+                hotspot_map = hotspot_future.result()
+                dashboard = dashboard_future.result()
+            if chart:
+                visualizations["Complexity Chart"] = os.path.basename(chart)
+            if hotspot_map:
+                visualizations["Hotspot Map"] = os.path.basename(hotspot_map)
+            if dashboard:
+                visualizations["Dashboard"] = os.path.basename(dashboard)
+            self._viz_cache[key] = visualizations
+
+        complexity = metrics.get("complexity", {})
+        summary = complexity.get("summary", {})
+        issues = complexity.get("issues", [])
+        hotspots = metrics.get("hotspots", [])
+        recommendations = metrics.get("recommendations", [])
+
+        output_file = os.path.join(self.output_dir, filename)
+        sidecar = os.path.splitext(output_file)[0] + ".metrics.json"
+        with open(sidecar, "wb") as sidecar_file:
+            sidecar_file.write(payload)
+        with open(output_file, "w", buffering=1 << 16) as f:
+            write = f.write
+            write(f"""<!DOCTYPE html>
+<html>
+<head>
+<title>Performance Report</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; color: #222; }}
+table {{ border-collapse: collapse; }}
+td, th {{ border: 1px solid #ccc; padding: 0.4em 0.8em; }}
+.good {{ background: #e6f4ea; }}
+.warning {{ background: #fff4d6; }}
+.critical {{ background: #fbe3e4; }}
+.issue, .hotspot, .recommendation {{ margin: 0.5em 0; padding: 0.5em; border-left: 4px solid #999; }}
+.high {{ border-left-color: #c0392b; }}
+.medium {{ border-left-color: #e67e22; }}
+img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<h1>Performance Report</h1>
+<p>File: {metrics.get('file', 'unknown')}</p>
+<p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+""")
+            write("<h2>Summary</h2>\n<table>\n")
+            avg_cyc = summary.get("avg_cyclomatic_complexity", 0)
+            max_cyc = summary.get("max_cyclomatic_complexity", 0)
+            avg_cog = summary.get("avg_cognitive_complexity", 0)
+            max_cog = summary.get("max_cognitive_complexity", 0)
+            avg_len = summary.get("avg_method_length", 0)
+            max_len = summary.get("max_method_length", 0)
+            max_size = summary.get("max_class_size", 0)
+            max_depth = summary.get("max_inheritance_depth", 0)
+            write(f"""<tr><td>Average Cyclomatic Complexity</td>
+<td class="{self._get_severity_class(avg_cyc, 5, 10)}">{avg_cyc:.2f}</td></tr>
+<tr><td>Maximum Cyclomatic Complexity</td>
+<td class="{self._get_severity_class(max_cyc, 10, 15)}">{max_cyc}</td></tr>
+<tr><td>Average Cognitive Complexity</td>
+<td class="{self._get_severity_class(avg_cog, 8, 15)}">{avg_cog:.2f}</td></tr>
+<tr><td>Maximum Cognitive Complexity</td>
+<td class="{self._get_severity_class(max_cog, 15, 25)}">{max_cog}</td></tr>
+<tr><td>Average Method Length</td>
+<td class="{self._get_severity_class(avg_len, 25, 50)}">{avg_len:.2f}</td></tr>
+<tr><td>Maximum Method Length</td>
+<td class="{self._get_severity_class(max_len, 50, 100)}">{max_len}</td></tr>
+<tr><td>Maximum Class Size</td>
+<td class="{self._get_severity_class(max_size, 200, 400)}">{max_size}</td></tr>
+<tr><td>Maximum Inheritance Depth</td>
+<td class="{self._get_severity_class(max_depth, 3, 5)}">{max_depth}</td></tr>
+</table>
+""")
+            write("<h2>Issues</h2>\n")
+            for issue in issues:
+                write(f"""<div class="issue {issue.severity}">
+<strong>[{issue.severity}]</strong> {issue.msg}
+</div>
+""")
+            write("<h2>Hotspots</h2>\n")
+            for hotspot in hotspots:
+                write(f"""<div class="hotspot">
+<strong>{hotspot.location}</strong>: {hotspot.reason}<br>
+Suggestion: {hotspot.suggestion}
+</div>
+""")
+            write("<h2>Recommendations</h2>\n")
+            for rec in recommendations:
+                write(f"""<div class="recommendation">
+<strong>{rec.target}</strong>: {rec.recommendation}
+</div>
+""")
+            for title, image in visualizations.items():
+                write(f"""<h2>{title}</h2>
+<img src="{image}" alt="{title}">
+""")
+            template_path = os.path.join("review_templates", "performance.md")
+            if os.path.exists(template_path):
+                with open(template_path, "r") as template_file:
+                    template_content = template_file.read()
+                template_html = _MD_RE.sub(
+                    lambda match: _MD_REPLACEMENTS[match.group(0)],
+                    template_content,
+                )
+                write(f"""<h2>Review Checklist</h2>
+<div class="template">{template_html}</div>
+""")
+            write("</body>\n</html>\n")
+        return output_file
+
+    def _get_severity_class(self, value, warning_threshold, critical_threshold):
+        """CSS class for a summary value relative to its thresholds."""
+        if value >= critical_threshold:
+            return "critical"
+        if value >= warning_threshold:
+            return "warning"
+        return "good"
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from performance_metrics import RuntimePerformanceAnalyzer
+
+    analyzer = RuntimePerformanceAnalyzer()
+    results = analyzer.analyze_code_file("example_code.py")
+    visualizer = PerformanceVisualizer()
+    report = visualizer.create_html_report(results)
+    print(f"Report written to {report}")
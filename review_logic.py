@@ -0,0 +1,703 @@
+"""Template-driven code review checks for the code review assistant."""
+
+import ast
+import functools
+import hashlib
+import io
+import logging
+import mmap
+import os
+import re
+import tokenize
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=16)
+def _template_text(path):
+    """Read a template file once; construction does no template I/O."""
+    with open(path) as f:
+        return f.read()
+
+
+def _compile(pattern):
+    """Compile a scanner pattern, preferring RE2's linear-time engine.
+
+    RE2 guarantees worst-case linear matching, which matters when the
+    reviewer is pointed at untrusted or very large files. Patterns RE2
+    rejects at compile time fall back to the stdlib engine.
+    """
+    if HAS_RE2:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            logger.debug("RE2 rejected pattern %r; using re", pattern)
+    return re.compile(pattern)
+
+# Scanner patterns, compiled once at import. Going through re.search with
+# string literals pays a cache lookup and flag parse on every call, and
+# the module cache is purged wholesale once it fills up.
+_RE_FUNC_BLOCK = _compile(rb"def\s+\w+[^\n]*\n(?:[ \t]+[^\n]*\n?)+")
+
+# One named-group fragment per single-hit check. Each template compiles
+# just the fragments it can turn into issues, so a review runs a single
+# finditer over exactly the patterns that matter for it. with_open must
+# precede open in the performance bundle so a guarded call is not
+# counted as a bare one.
+_CHECK_PATTERNS = {
+    "sqli": rb"(?P<sqli>execute\s*\(\s*f?['\"][^'\"]*\{\s*\w+\s*\})",
+    "cred": rb"(?P<cred>(?i:password|api_key|secret|token)\s*=\s*['\"])",
+    "bare_except": rb"(?P<bare_except>except\s*:)",
+    "with_open": rb"(?P<with_open>with\s+open\s*\()",
+    "open": rb"(?P<open>open\s*\()",
+    "commented_code":
+        rb"(?P<commented_code>#\s*(?:def|class|if|for|while|return)\b)",
+}
+
+# Anchored headers for the multi-line checks, matched one line at a time
+# by _line_shape_hits. The old cross-line fragments used .+ ahead of a
+# required newline and could backtrack polynomially on long lines.
+_RE_FOR_HEADER = _compile(rb"^([ \t]*)for\s+\w+\s+in\b")
+_RE_LISTCOMP_ASSIGN = _compile(rb"^[ \t]*\w+\s*=\s*\[.*\bfor\b.*\]")
+
+# Matched against a COMMENT token's text past the leading '#'; str mode
+# because the tokenizer yields decoded token strings.
+_RE_LEADING_KW = _compile(r"\s*(?:def|class|if|for|while|return)\b")
+
+# The single-hit checks each template consumes; duplication and the
+# comment ratio have their own non-pattern passes. nested_loop and
+# listcomp_seq are line-shape checks served by _line_shape_hits rather
+# than a fragment in _CHECK_PATTERNS.
+_TEMPLATE_CHECKS = {
+    "general": ("commented_code",),
+    "security": ("sqli", "cred", "bare_except"),
+    "performance": ("nested_loop", "with_open", "open", "listcomp_seq"),
+}
+
+
+def _compile_scanner(names):
+    """Build a one-pass scanner over the named checks' combined pattern."""
+    compiled = _compile(rb"|".join(_CHECK_PATTERNS[name]
+                                   for name in names
+                                   if name in _CHECK_PATTERNS))
+
+    def scan(code):
+        return {match.lastgroup for match in compiled.finditer(code)}
+
+    return scan
+
+
+def _line_shape_hits(code):
+    """Scan for the multi-line checks one anchored line at a time.
+
+    A nested loop is a for header directly followed by a deeper-indented
+    one; adjacent comprehensions are two assignment-to-listcomp lines in
+    a row. Each line is tested against an anchored header at most once,
+    so the pass is linear however the trailing context looks.
+    """
+    hits = set()
+    prev_for_indent = None
+    prev_listcomp = False
+    for line in code.split(b"\n"):
+        match = _RE_FOR_HEADER.match(line)
+        if match is not None:
+            indent = match.group(1)
+            if (prev_for_indent is not None
+                    and len(indent) > len(prev_for_indent)
+                    and indent.startswith(prev_for_indent)):
+                hits.add("nested_loop")
+            prev_for_indent = indent
+        else:
+            prev_for_indent = None
+        if _RE_LISTCOMP_ASSIGN.match(line) is not None:
+            if prev_listcomp:
+                hits.add("listcomp_seq")
+            prev_listcomp = True
+        else:
+            prev_listcomp = False
+    return hits
+
+# The same checks as _RE_ALL in hyperscan form: (pattern, name, flags).
+# Hyperscan compiles the whole set into one automaton and reports every
+# match in a single streaming pass over the input.
+_HS_PATTERNS = (
+    (rb"execute\s*\(\s*f?['\"][^'\"]*\{\s*\w+\s*\}", "sqli", 0),
+    (rb"(?:password|api_key|secret|token)\s*=\s*['\"]", "cred", "caseless"),
+    (rb"except\s*:", "bare_except", 0),
+    (rb"for\s+\w+\s+in\s+[^\n]+:\s*\n\s+for\s+\w+\s+in", "nested_loop", 0),
+    (rb"with\s+open\s*\(", "with_open", 0),
+    (rb"open\s*\(", "open", 0),
+    (rb"#\s*(?:def|class|if|for|while|return)\b", "commented_code", 0),
+    (rb"\n\s*\w+\s*=\s*\[[^\n]*\bfor\b[^\n]*\]"
+     rb"\s*\n\s*\w+\s*=\s*\[[^\n]*\bfor\b[^\n]*\]", "listcomp_seq", 0),
+)
+
+
+def _build_hyperscan_db():
+    """Compile the scanner set into one hyperscan database, or None."""
+    if not HAS_HYPERSCAN:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern for pattern, _, _ in _HS_PATTERNS],
+            ids=list(range(len(_HS_PATTERNS))),
+            flags=[hyperscan.HS_FLAG_CASELESS if flag == "caseless" else 0
+                   for _, _, flag in _HS_PATTERNS],
+        )
+        return db
+    except hyperscan.error:
+        logger.debug("hyperscan rejected the scanner set; using re")
+        return None
+
+
+# Literal fragments required for any scanner pattern to match. A file
+# containing none of them cannot produce a hit, so a handful of
+# memchr-backed find calls replace the full pattern scan on clean files.
+# Each needle must be at least as permissive as the check it guards:
+# open and for stop at the bare word because the patterns allow
+# whitespace before the paren and after the keyword. The credential
+# literals match in any case, mirroring the (?i:) in the cred pattern,
+# so they are probed with one caseless alternation — exact finds would
+# skip a file holding only PASSWORD = "...".
+_NEEDLES = (b"execute", b"open", b"except", b"for", b"#")
+_RE_CRED_NEEDLES = _compile(rb"(?i:password|api_key|secret|token)")
+
+# How many (content hash, template) review results to keep per reviewer.
+_REVIEW_CACHE_MAX = 256
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _is_word_byte(byte):
+        return (0x30 <= byte <= 0x39 or 0x41 <= byte <= 0x5A
+                or byte == 0x5F or 0x61 <= byte <= 0x7A)
+
+    @njit(cache=True)
+    def _starts_with_word(arr, i, eol, word):
+        """True when word starts at i and ends on a word boundary."""
+        end = i + len(word)
+        if end > eol:
+            return False
+        for k in range(len(word)):
+            if arr[i + k] != word[k]:
+                return False
+        return end == eol or not _is_word_byte(arr[end])
+
+    @njit(cache=True)
+    def _has_in_keyword(arr, i, eol):
+        """True when the line slice contains a bare ' in' keyword."""
+        k = i
+        while k + 3 <= eol:
+            if (arr[k] == 0x20 and arr[k + 1] == 0x69
+                    and arr[k + 2] == 0x6E
+                    and (k + 3 == eol or not _is_word_byte(arr[k + 3]))):
+                return True
+            k += 1
+        return False
+
+    @njit(cache=True)
+    def _scan_lines(arr):
+        """Single byte-level pass over the source.
+
+        Returns (comment lines, non-blank lines, commented-out code seen,
+        nested for loop seen) so one compiled loop answers the comment
+        ratio and both line-shape heuristics at once.
+        """
+        comment_count = 0
+        nonblank = 0
+        has_commented_code = False
+        has_nested_loop = False
+        prev_for_indent = -1
+        n = arr.size
+        i = 0
+        while i < n:
+            j = i
+            while j < n and (arr[j] == 0x20 or arr[j] == 0x09):
+                j += 1
+            indent = j - i
+            eol = j
+            while eol < n and arr[eol] != 0x0A:
+                eol += 1
+            if j < eol and arr[j] != 0x0D:
+                nonblank += 1
+                if arr[j] == 0x23:  # '#'
+                    comment_count += 1
+                    k = j + 1
+                    while k < eol and arr[k] == 0x20:
+                        k += 1
+                    if (_starts_with_word(arr, k, eol, b"def")
+                            or _starts_with_word(arr, k, eol, b"class")
+                            or _starts_with_word(arr, k, eol, b"if")
+                            or _starts_with_word(arr, k, eol, b"for")
+                            or _starts_with_word(arr, k, eol, b"while")
+                            or _starts_with_word(arr, k, eol, b"return")):
+                        has_commented_code = True
+                    prev_for_indent = -1
+                elif (_starts_with_word(arr, j, eol, b"for")
+                        and _has_in_keyword(arr, j, eol)):
+                    if prev_for_indent >= 0 and indent > prev_for_indent:
+                        has_nested_loop = True
+                    prev_for_indent = indent
+                else:
+                    prev_for_indent = -1
+            i = eol + 1
+        return comment_count, nonblank, has_commented_code, has_nested_loop
+
+
+def _structural_flags(code):
+    """Answer the structural checks from a real parse of the source.
+
+    Returns (nested loop, open outside with, adjacent list comprehensions)
+    or None when the file does not parse, in which case the caller keeps
+    the regex verdicts. One C-implemented parse replaces three textual
+    approximations; the commented-code check stays textual since comments
+    never reach the AST.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    nested_loop = False
+    listcomp_seq = False
+    open_calls = []
+    with_calls = set()
+    stack = [(tree, 0)]
+    while stack:
+        node, for_depth = stack.pop()
+        node_type = type(node)
+        if node_type in (ast.For, ast.AsyncFor):
+            if for_depth:
+                nested_loop = True
+            for_depth += 1
+        elif node_type is ast.withitem:
+            if type(node.context_expr) is ast.Call:
+                with_calls.add(id(node.context_expr))
+        elif node_type is ast.Call:
+            if type(node.func) is ast.Name and node.func.id == "open":
+                open_calls.append(id(node))
+        body = getattr(node, "body", None)
+        if isinstance(body, list):
+            previous_was_listcomp = False
+            for stmt in body:
+                is_listcomp = (type(stmt) is ast.Assign
+                               and type(stmt.value) is ast.ListComp)
+                if is_listcomp and previous_was_listcomp:
+                    listcomp_seq = True
+                previous_was_listcomp = is_listcomp
+        for child in ast.iter_child_nodes(node):
+            stack.append((child, for_depth))
+    bare_open = any(call not in with_calls for call in open_calls)
+    return nested_loop, bare_open, listcomp_seq
+
+
+def _token_stats(code):
+    """Comment statistics from one pass over the real token stream.
+
+    Returns (comment lines, non-blank lines, commented-out code seen) or
+    None when the source does not tokenize, in which case the caller
+    keeps the textual approximations. Tokens never come from inside a
+    string, so a "# def ..." in a docstring cannot be mistaken for
+    commented-out code, and the same stream answers the comment ratio.
+    """
+    skip = (tokenize.NL, tokenize.NEWLINE, tokenize.INDENT,
+            tokenize.DEDENT, tokenize.ENCODING, tokenize.ENDMARKER)
+    comment_count = 0
+    nonblank = 0
+    has_commented_code = False
+    last_row = 0
+    try:
+        for tok in tokenize.tokenize(io.BytesIO(code).readline):
+            if tok.type == tokenize.COMMENT:
+                comment_count += 1
+                if _RE_LEADING_KW.match(tok.string, 1):
+                    has_commented_code = True
+            elif tok.type in skip:
+                continue
+            row = tok.start[0]
+            if row != last_row:
+                nonblank += 1
+                last_row = row
+    except (tokenize.TokenError, SyntaxError, ValueError):
+        return None
+    return comment_count, nonblank, has_commented_code
+
+
+def _count_comment_lines(buf):
+    """Count (comment lines, non-blank lines) in one vectorized pass.
+
+    Works on the raw byte view: find each line's first byte that is not
+    space or tab, then test it against '#'. All per-line work happens in
+    C instead of allocating and stripping a str per line.
+    """
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    if arr.size == 0:
+        return 0, 0
+    newlines = np.flatnonzero(arr == 0x0A)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [arr.size]))
+    nonspace = np.flatnonzero(
+        (arr != 0x20) & (arr != 0x09) & (arr != 0x0D) & (arr != 0x0A)
+    )
+    if nonspace.size == 0:
+        return 0, 0
+    # Index of the first non-whitespace byte at or after each line start.
+    first = np.searchsorted(nonspace, starts)
+    idx = nonspace[np.minimum(first, nonspace.size - 1)]
+    nonblank = (first < nonspace.size) & (idx < ends)
+    comments = nonblank & (arr[idx] == 0x23)
+    return int(comments.sum()), int(nonblank.sum())
+
+
+class CodeReviewer:
+    """Runs template-specific review checks against a source file."""
+
+    def __init__(self, template_dir="review_templates",
+                 performance_analyzer=None):
+        self.template_dir = template_dir
+        self.templates = self._load_templates()
+        # Built on first performance review unless one is injected, so
+        # general and security reviews never import performance_metrics.
+        self._performance_analyzer = performance_analyzer
+        # Maps (content hash, template type) to an issue list so repeat
+        # reviews of unchanged files skip the scans entirely.
+        self._review_cache = {}
+        self._scanners = {template: _compile_scanner(names)
+                          for template, names in _TEMPLATE_CHECKS.items()}
+        self._hs_db = _build_hyperscan_db()
+
+    def _load_templates(self):
+        """Map template names to paths; contents are read on first use."""
+        templates = {}
+        if not os.path.isdir(self.template_dir):
+            logger.warning("Template directory %s not found", self.template_dir)
+            return templates
+        with os.scandir(self.template_dir) as entries:
+            for entry in entries:
+                if (entry.name.endswith(".md")
+                        and entry.is_file(follow_symlinks=False)):
+                    templates[entry.name[:-3]] = entry.path
+        return templates
+
+    def template_text(self, name):
+        """The named template's markdown, read lazily and cached."""
+        return _template_text(self.templates[name])
+
+    def review_code(self, file_path, template_type="general"):
+        """Review a file and return a dict of issues for the template."""
+        with open(file_path, "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0,
+                               access=mmap.ACCESS_READ) as code:
+                    return self._review_bytes(code, file_path, template_type)
+            except ValueError:
+                # Empty files cannot be mapped.
+                return self._review_bytes(f.read(), file_path, template_type)
+
+    def review_paths(self, paths, template_type="general"):
+        """Review many files, fanning out across CPU cores when worthwhile.
+
+        Per-file scans are independent and CPU-bound, so large batches go
+        to a process pool; small batches stay serial since worker startup
+        and result pickling would dominate. Workers build their own
+        reviewer rather than pickling this one and its scanner state.
+        """
+        paths = list(paths)
+        if len(paths) < _PARALLEL_MIN_FILES:
+            return [self.review_code(path, template_type) for path in paths]
+        worker = functools.partial(_review_one, template_type=template_type)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(worker, paths, chunksize=16))
+
+    def _review_bytes(self, code, file_path, template_type):
+        """Run the template's checks over a bytes view of the source."""
+        cache_key = (hashlib.sha1(code).digest(), template_type)
+        issues = self._review_cache.get(cache_key)
+        if issues is None:
+            if template_type not in _TEMPLATE_CHECKS:
+                raise ValueError(f"Unknown template type: {template_type}")
+            hits, line_stats = self._scan(code, template_type)
+            if template_type == "general":
+                # Split once here when no cheaper line statistics exist;
+                # every line-based helper shares the same list.
+                lines = None
+                if line_stats is None and not HAS_NUMPY:
+                    lines = bytes(code).split(b"\n")
+                issues = self._general_review(code, hits, line_stats, lines)
+            elif template_type == "security":
+                issues = self._security_review(hits)
+            else:
+                issues = self._performance_review(hits, file_path)
+            if len(self._review_cache) >= _REVIEW_CACHE_MAX:
+                self._review_cache.pop(next(iter(self._review_cache)))
+            self._review_cache[cache_key] = issues
+        return {
+            "file": file_path,
+            "template": template_type,
+            "issues": list(issues),
+        }
+
+    def _scan(self, code, template_type):
+        """Collect the template's pattern hits plus line statistics.
+
+        Only the checks the template consumes are run: the security
+        review never pays for line statistics or a parse, and the
+        general review never scans for SQL interpolation. When the file
+        tokenizes, the general review takes its comment counts and the
+        commented-code verdict from the token stream; otherwise, with
+        numba installed, one compiled byte-level pass supplies them
+        along with the nested-loop flag, and when the file parses the
+        structural verdicts from the AST win over the textual ones.
+        """
+        scanned = False
+        if (not any(code.find(needle) != -1 for needle in _NEEDLES)
+                and _RE_CRED_NEEDLES.search(code) is None):
+            hits = set()
+        elif self._hs_db is not None:
+            wanted = _TEMPLATE_CHECKS[template_type]
+            hits = set()
+
+            def on_match(pattern_id, start, end, flags, context=None):
+                name = _HS_PATTERNS[pattern_id][1]
+                if name in wanted:
+                    hits.add(name)
+
+            self._hs_db.scan(bytes(code), match_event_handler=on_match)
+        else:
+            hits = self._scanners[template_type](code)
+            scanned = True
+        line_stats = None
+        if template_type == "general":
+            stats = _token_stats(code)
+            if stats is not None:
+                comment_count, total, commented_code = stats
+                line_stats = (comment_count, total)
+                hits.discard("commented_code")
+                if commented_code:
+                    hits.add("commented_code")
+        if (line_stats is None and template_type != "security"
+                and HAS_NUMBA):
+            arr = np.frombuffer(code, dtype=np.uint8)
+            comment_count, total, commented_code, nested_loop = \
+                _scan_lines(arr)
+            line_stats = (comment_count, total)
+            hits.discard("commented_code")
+            hits.discard("nested_loop")
+            if commented_code and template_type == "general":
+                hits.add("commented_code")
+            if nested_loop and template_type == "performance":
+                hits.add("nested_loop")
+        if template_type == "performance":
+            # The line scan and the parse both need contiguous bytes, so
+            # an mmap view is materialized once and shared between them.
+            buf = bytes(code)
+            if scanned:
+                hits |= _line_shape_hits(buf)
+            flags = _structural_flags(buf)
+            if flags is not None:
+                nested_loop, bare_open, listcomp_seq = flags
+                hits.difference_update(
+                    ("nested_loop", "listcomp_seq", "open", "with_open"))
+                if nested_loop:
+                    hits.add("nested_loop")
+                if listcomp_seq:
+                    hits.add("listcomp_seq")
+                if bare_open:
+                    hits.add("open")
+        return hits, line_stats
+
+    def _general_review(self, code, hits, line_stats=None, lines=None):
+        """Checks applied by the general review template.
+
+        Helpers that need line structure receive the split computed by
+        the caller instead of re-splitting the source themselves.
+        """
+        issues = []
+        if self._has_code_duplication(code):
+            issues.append({
+                "category": "duplication",
+                "message": "Duplicated function bodies detected",
+                "severity": "medium",
+            })
+        if not self._has_proper_comments(code, line_stats, lines):
+            issues.append({
+                "category": "comments",
+                "message": "Less than 10% of non-blank lines are comments",
+                "severity": "low",
+            })
+        if "commented_code" in hits:
+            issues.append({
+                "category": "commented_code",
+                "message": "Commented-out code should be removed",
+                "severity": "low",
+            })
+        return issues
+
+    def _security_review(self, hits):
+        """Checks applied by the security review template."""
+        issues = []
+        if "cred" in hits:
+            issues.append({
+                "category": "credentials",
+                "message": "Hardcoded credentials found",
+                "severity": "high",
+            })
+        if "sqli" in hits:
+            issues.append({
+                "category": "sql_injection",
+                "message": "Query built with interpolated values",
+                "severity": "high",
+            })
+        if "bare_except" in hits:
+            issues.append({
+                "category": "error_handling",
+                "message": "Bare except clause swallows all errors",
+                "severity": "medium",
+            })
+        return issues
+
+    def _performance_review(self, hits, file_path):
+        """Checks applied by the performance review template."""
+        issues = []
+        if "nested_loop" in hits:
+            issues.append({
+                "category": "nested_loops",
+                "message": "Nested loops may indicate quadratic behaviour",
+                "severity": "medium",
+            })
+        if "open" in hits and "with_open" not in hits:
+            issues.append({
+                "category": "resource_leak",
+                "message": "File opened without a with statement",
+                "severity": "medium",
+            })
+        if "listcomp_seq" in hits:
+            issues.append({
+                "category": "redundant_passes",
+                "message": "Consecutive comprehensions traverse the data twice",
+                "severity": "low",
+            })
+        if self._performance_analyzer is None:
+            from performance_metrics import RuntimePerformanceAnalyzer
+            self._performance_analyzer = RuntimePerformanceAnalyzer()
+        results = self._performance_analyzer.analyze_code_file(file_path)
+        for hotspot in results.get("hotspots", []):
+            issues.append({
+                "category": "hotspot",
+                "message": f"{hotspot.location}: {hotspot.reason}",
+                "severity": "medium",
+            })
+        return issues
+
+    def _has_code_duplication(self, code):
+        # Hash each function body (whitespace-normalized) and look for a
+        # repeat. The old backreference regex could backtrack for ages on
+        # long inputs; this stays linear in the size of the file.
+        seen = set()
+        for match in _RE_FUNC_BLOCK.finditer(code):
+            block = match.group(0)
+            body = block[block.index(b"\n") + 1:]
+            normalized = b" ".join(body.split())
+            if len(normalized) < 10:
+                continue
+            digest = hashlib.blake2b(normalized, digest_size=8).digest()
+            if digest in seen:
+                return True
+            seen.add(digest)
+        return False
+
+    def _has_proper_comments(self, code, line_stats=None, lines=None):
+        if line_stats is not None:
+            comment_count, total = line_stats
+        elif HAS_NUMPY:
+            comment_count, total = _count_comment_lines(code)
+        else:
+            if lines is None:
+                lines = bytes(code).split(b"\n")
+            # translate runs in libc and deleting space/tab/CR leaves the
+            # first non-whitespace byte in front, so one call replaces
+            # the strip-and-startswith pair per line.
+            comment_count = 0
+            total = 0
+            for line in lines:
+                stripped = line.translate(None, b" \t\r")
+                if stripped:
+                    total += 1
+                    if stripped[:1] == b"#":
+                        comment_count += 1
+        if total == 0:
+            return True
+        return comment_count * 10 >= total
+
+    def generate_review_report(self, review, output_format="markdown"):
+        """Format a review result as markdown or plain text."""
+        issues = review["issues"]
+        if output_format == "markdown":
+            parts = [
+                "# Code Review Report\n\n",
+                f"## File: {review['file']}\n\n",
+                f"## Template: {review['template']}\n\n",
+            ]
+            if not issues:
+                parts.append("No issues found.\n")
+            for i, issue in enumerate(issues, 1):
+                parts.extend((
+                    f"### {i}. {issue['category']}\n\n",
+                    f"- Severity: {issue['severity']}\n",
+                    f"- {issue['message']}\n\n",
+                ))
+            return "".join(parts)
+        parts = [f"Code review for {review['file']} "
+                 f"({review['template']} template)\n"]
+        if not issues:
+            parts.append("No issues found.\n")
+        for i, issue in enumerate(issues, 1):
+            parts.append(f"{i}. [{issue['severity']}] "
+                         f"{issue['category']}: {issue['message']}\n")
+        return "".join(parts)
+
+
+_PARALLEL_MIN_FILES = 4
+
+_worker_reviewer = None
+
+
+def _review_one(file_path, template_type):
+    """Review one file in a worker process, reusing its reviewer."""
+    global _worker_reviewer
+    if _worker_reviewer is None:
+        _worker_reviewer = CodeReviewer()
+    return _worker_reviewer.review_code(file_path, template_type)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    reviewer = CodeReviewer()
+    for template in ("general", "security", "performance"):
+        review = reviewer.review_code("example_code.py", template)
+        print(reviewer.generate_review_report(review))